@@ -1,16 +1,25 @@
 #!/usr/bin/env python3
 
+import ctypes
+import fcntl
+import functools
+import hashlib
+import http.client
 import json
-import math
 import os
+import re
+import signal
+import struct
 import subprocess
 import time
 import sys
-from typing import List
-import configparser
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 import logging
 from dataclasses import dataclass
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, WaiterError
+from botocore.waiter import WaiterModel, create_waiter_with_client
 
 try:
     import boto3
@@ -22,6 +31,15 @@ except ImportError as e:
     import psutil
     import typer
 
+# orjson is optional, the stdlib json module is used when it isn't installed
+try:
+    from orjson import loads as _json_loads, dumps as _json_dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -31,7 +49,272 @@ logger = logging.getLogger(__name__)
 
 app = typer.Typer()
 
+# Set by SIGTERM/SIGINT to stop the monitor loop without waiting out the interval
+_stop = threading.Event()
+
 AWS_REGION = 'eu-west-1'
+IMDS_HOST = '169.254.169.254'
+GIB = 1 << 30
+BLKGETSIZE64 = 0x80081272
+NVME_IOCTL_ADMIN_CMD = 0xC0484E41
+NVME_ADMIN_IDENTIFY = 0x06
+NVME_IDENTIFY_CONTROLLER = 0x01
+NVME_IDENTIFY_DATA_LEN = 4096
+EBS_NVME_MODEL = 'Amazon Elastic Block Store'
+# Partition number suffix of NVMe partition paths, e.g. /dev/nvme0n1p1
+NVME_PARTITION_RE = re.compile(r'p(\d+)$')
+# Grows the partition (if a partition number is given), then expands the filesystem:
+# xfs_growfs takes the mountpoint, resize2fs the partition path. Prints the filesystem
+# type on stdout, tool output goes to stderr. Args: device partition_number partition mountpoint
+# fs_type, blkid is only run if fs_type is empty
+EXPAND_FILESYSTEM_SCRIPT = """
+if [ -n "$2" ]; then
+    growpart "$1" "$2" >&2 || exit 10
+fi
+fs_type=${5:-$(blkid -o value -s TYPE "$3")}
+echo "$fs_type"
+if [ "$fs_type" = xfs ]; then
+    xfs_growfs -d "$4" >&2 || exit 11
+else
+    resize2fs "$3" >&2 || exit 12
+fi
+"""
+# Exit codes of EXPAND_FILESYSTEM_SCRIPT to the step that failed
+EXPAND_FILESYSTEM_STEPS = {
+    10: 'grow partition',
+    11: 'expand XFS filesystem',
+    12: 'expand ext filesystem'
+}
+# Upper bound in seconds of the retry delay for a volume that keeps failing to scale
+MAX_SCALING_BACKOFF = 3600
+# Maximum scaled volume rows kept for retry after failed notifications
+MAX_PENDING_NOTIFICATIONS = 100
+# Resolved tool paths, reused across restarts for up to TOOLS_CACHE_TTL seconds
+TOOLS_CACHE_FILE = '/var/cache/ebs-scaler/tools.json'
+TOOLS_CACHE_TTL = 3600
+# Seconds to wait for the kernel to see a resized EBS volume
+DEVICE_RESIZE_TIMEOUT = 60
+# Concurrent workers for I/O bound per-device probes (ioctl, statvfs, subprocess)
+PROBE_WORKERS = 8
+# Capability bits from linux/capability.h
+CAP_DAC_OVERRIDE = 1
+CAP_SYS_ADMIN = 21
+CAP_SYS_RESOURCE = 24
+
+# Waits up to 30 minutes (120 * 15s) for an EBS volume modification to complete
+VOLUME_MODIFIED_WAITER_MODEL = WaiterModel({
+    'version': 2,
+    'waiters': {
+        'VolumeModified': {
+            'delay': 15,
+            'maxAttempts': 120,
+            'operation': 'DescribeVolumesModifications',
+            'acceptors': [
+                {
+                    'matcher': 'pathAll',
+                    'expected': 'completed',
+                    'argument': 'VolumesModifications[].ModificationState',
+                    'state': 'success'
+                },
+                {
+                    'matcher': 'pathAny',
+                    'expected': 'failed',
+                    'argument': 'VolumesModifications[].ModificationState',
+                    'state': 'failure'
+                },
+                {
+                    'matcher': 'path',
+                    'expected': True,
+                    'argument': 'length(VolumesModifications[]) == `0`',
+                    'state': 'failure'
+                }
+            ]
+        }
+    }
+})
+
+# HTML table of scaled volumes in the notification email. Rows are filled with str.format_map
+NOTIFICATION_TABLE_HEAD = """
+            <table style="border-collapse: collapse; width: 100%;">
+                <thead>
+                    <tr style="background-color: #f2f2f2;">
+                        <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Volume ID</th>
+                        <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Mount Point</th>
+                        <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Device Name</th>
+                        <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Partition Path</th>
+                        <th style="border: 1px solid #ddd; padding: 8px; text-align: right;">Scale Threshold</th>
+                        <th style="border: 1px solid #ddd; padding: 8px; text-align: right;">Expanded by size(GB)</th>
+                        <th style="border: 1px solid #ddd; padding: 8px; text-align: right;">Previous Device size(GB)</th>
+                        <th style="border: 1px solid #ddd; padding: 8px; text-align: right;">New Device size(GB)</th>
+                        <th style="border: 1px solid #ddd; padding: 8px; text-align: right;">New Overall Volume size(GB)</th>
+                    </tr>
+                </thead>
+                <tbody>"""
+NOTIFICATION_ROW_TEMPLATE = """
+                    <tr>
+                        <td style="border: 1px solid #ddd; padding: 8px;">{volume_id}</td>
+                        <td style="border: 1px solid #ddd; padding: 8px;">{mountpoint}</td>
+                        <td style="border: 1px solid #ddd; padding: 8px;">{device_name}</td>
+                        <td style="border: 1px solid #ddd; padding: 8px;">{partition_path}</td>
+                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{threshold}%</td>
+                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{expanded_size_gb}</td>
+                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{last_device_size_gb}</td>
+                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{new_device_size_total_gb}</td>
+                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{new_volume_size_gb}</td>
+                    </tr>"""
+NOTIFICATION_TABLE_TAIL = """
+                </tbody>
+            </table>"""
+
+def _parse_ini(f) -> dict:
+    """Parse a simple INI file object into {section: {key: value}}. Keys are lowercased like configparser does"""
+    config = {}
+    section = None
+    for line in f:
+        line = line.strip()
+        if not line or line.startswith(('#', ';')):
+            continue
+        if line.startswith('[') and line.endswith(']'):
+            section = config.setdefault(line[1:-1].strip(), {})
+            continue
+        if section is None:
+            raise ValueError(f"Key outside of a section in {f.name}: {line}")
+        key, sep, value = line.partition('=')
+        if not sep:
+            raise ValueError(f"Invalid line in {f.name}: {line}")
+        section[key.strip().lower()] = value.strip()
+    return config
+
+def _load_json(path: str):
+    """Read and parse a JSON file, None if it doesn't exist"""
+    try:
+        with open(path, 'rb') as f:
+            return _json_loads(f.read())
+    except FileNotFoundError:
+        return None
+
+def _parse_bool(value: str) -> bool:
+    """Parse an INI boolean the way configparser.getboolean does"""
+    states = {'1': True, 'yes': True, 'true': True, 'on': True,
+              '0': False, 'no': False, 'false': False, 'off': False}
+    if value.lower() not in states:
+        raise ValueError(f"Not a boolean: {value}")
+    return states[value.lower()]
+
+def _read_mountinfo() -> List[tuple]:
+    """Read (major:minor, mountpoint, filesystem type) for every mount from /proc/self/mountinfo"""
+    mounts = []
+    with open('/proc/self/mountinfo', 'r') as f:
+        for line in f:
+            fields = line.split()
+            # Mountpoints escape whitespace and backslashes as octal, e.g. '\040'
+            mountpoint = re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), fields[4])
+            # Optional fields end with a '-' separator, followed by the filesystem type
+            fs_type = fields[fields.index('-', 6) + 1]
+            mounts.append((fields[2], mountpoint, fs_type))
+    return mounts
+
+def _read_mounts() -> dict:
+    """Map 'major:minor' device numbers to their first mountpoint from /proc/self/mountinfo"""
+    mounts = {}
+    for dev_number, mountpoint, _ in _read_mountinfo():
+        mounts.setdefault(dev_number, mountpoint)
+    return mounts
+
+def _filesystem_type(device_path: str) -> Optional[str]:
+    """Get the filesystem type of a block device from /proc/self/mountinfo, None if not mounted"""
+    try:
+        rdev = os.stat(device_path).st_rdev
+    except OSError:
+        return None
+    dev_number = f"{os.major(rdev)}:{os.minor(rdev)}"
+    for mount_dev_number, _, fs_type in _read_mountinfo():
+        if mount_dev_number == dev_number:
+            return fs_type
+    return None
+
+def _bytes_to_gib(size_bytes: int) -> int:
+    """Convert bytes to GiB, rounding down"""
+    return size_bytes >> 30
+
+def _bytes_to_gib_ceil(size_bytes: int) -> int:
+    """Convert bytes to GiB, rounding up"""
+    return (size_bytes + GIB - 1) >> 30
+
+def _has_capability(cap: int) -> bool:
+    """Check a capability from /proc/self/status, falling back to euid 0.
+    Non-root child processes (growpart, resize tools) only keep ambient capabilities, so for
+    a non-root user the capability must be in both the effective and the ambient set"""
+    try:
+        sets = {}
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(('CapEff:', 'CapAmb:')):
+                    name, mask = line.split()
+                    sets[name] = int(mask, 16)
+        required = ['CapEff:'] if os.geteuid() == 0 else ['CapEff:', 'CapAmb:']
+        return all((sets[name] >> cap) & 1 for name in required)
+    except (OSError, ValueError, KeyError):
+        return os.geteuid() == 0
+
+def _find_tools(tools) -> dict:
+    """Resolve executables on PATH with one directory scan per PATH entry, {tool: path} for those found"""
+    found = {}
+    for path_dir in os.environ.get('PATH', os.defpath).split(os.pathsep):
+        missing = set(tools) - found.keys()
+        if not missing:
+            break
+        try:
+            with os.scandir(path_dir or '.') as entries:
+                for entry in entries:
+                    if entry.name in missing and entry.is_file() and os.access(entry.path, os.X_OK):
+                        found[entry.name] = entry.path
+        except OSError:
+            continue
+    return found
+
+def _read_block_device_size(device_path: str) -> int:
+    """Read the size of a block device in bytes with the BLKGETSIZE64 ioctl"""
+    fd = os.open(device_path, os.O_RDONLY)
+    try:
+        buf = fcntl.ioctl(fd, BLKGETSIZE64, b'\0' * 8)
+    finally:
+        os.close(fd)
+    return struct.unpack('Q', buf)[0]
+
+def _disk_usage(mountpoint: str) -> tuple[int, int, float]:
+    """Return (total bytes, used bytes, used percent) of a mounted filesystem, computed like psutil.disk_usage"""
+    st = os.statvfs(mountpoint)
+    total = st.f_blocks * st.f_frsize
+    used = total - st.f_bfree * st.f_frsize
+    total_user = used + st.f_bavail * st.f_frsize
+    percent = round(used / total_user * 100, 1) if total_user else 0.0
+    return total, used, percent
+
+@functools.lru_cache(maxsize=1)
+def _fetch_instance_id() -> str:
+    """Fetch the instance ID from IMDSv2 over one connection. Failures raise and are not cached"""
+    conn = http.client.HTTPConnection(IMDS_HOST, timeout=1)
+    try:
+        conn.request("PUT", "/latest/api/token",
+                     headers={"X-aws-ec2-metadata-token-ttl-seconds": "21600"})
+        response = conn.getresponse()
+        token = response.read().decode().strip()
+        if response.status != 200:
+            raise ValueError(f"IMDS token request failed with status {response.status}")
+
+        conn.request("GET", "/latest/meta-data/instance-id",
+                     headers={"X-aws-ec2-metadata-token": token})
+        response = conn.getresponse()
+        instance_id = response.read().decode().strip()
+        if response.status != 200:
+            raise ValueError(f"IMDS instance ID request failed with status {response.status}")
+    finally:
+        conn.close()
+
+    if not instance_id:
+        raise ValueError("Got empty instance ID")
+    return instance_id
 
 @dataclass
 class VolumeInfo:
@@ -40,13 +323,40 @@ class VolumeInfo:
     mountpoint: str
     partition_path: str
 
+def _read_ebs_volume_id(device_path: str) -> str:
+    """Read the EBS volume ID from the NVMe identify controller data of a device"""
+    data = ctypes.create_string_buffer(NVME_IDENTIFY_DATA_LEN)
+    # struct nvme_admin_cmd from <linux/nvme_ioctl.h>
+    cmd = bytearray(struct.pack(
+        '=BBHIIIQQII6III',
+        NVME_ADMIN_IDENTIFY, 0, 0,          # opcode, flags, rsvd1
+        0, 0, 0,                            # nsid, cdw2, cdw3
+        0, ctypes.addressof(data),          # metadata, addr
+        0, NVME_IDENTIFY_DATA_LEN,          # metadata_len, data_len
+        NVME_IDENTIFY_CONTROLLER, 0, 0, 0, 0, 0,  # cdw10..cdw15
+        0, 0                                # timeout_ms, result
+    ))
+    fd = os.open(device_path, os.O_RDONLY)
+    try:
+        fcntl.ioctl(fd, NVME_IOCTL_ADMIN_CMD, cmd)
+    finally:
+        os.close(fd)
+
+    # Serial number is bytes 4-23 and model number bytes 24-63 of the identify data
+    model = data.raw[24:64].decode('ascii', 'ignore').strip()
+    if model != EBS_NVME_MODEL:
+        raise ValueError(f"Device model '{model}' is not an EBS volume")
+    serial = data.raw[4:24].decode('ascii', 'ignore').strip()
+    if not serial.startswith('vol'):
+        raise ValueError(f"Unexpected EBS serial number '{serial}'")
+    if not serial.startswith('vol-'):
+        serial = f"vol-{serial[3:]}"
+    return serial
+
 class EBSAutoscaler:
     def __init__(self):
         self.config_file = os.path.expanduser("/opt/ebs-autoscaler/config.ini")
         self.volume_info_file = os.path.expanduser("/opt/ebs-autoscaler/volume_info.json")
-        self.config = configparser.ConfigParser()
-        self.ec2_client = boto3.client('ec2', region_name=AWS_REGION)
-        self.ses_client = boto3.client('ses', region_name=AWS_REGION)
         
         # Config values
         # General
@@ -59,63 +369,91 @@ class EBSAutoscaler:
         self.email_sender = ""
         self.email_recipients = []
         # Exclude
-        self.excluded_volumes = []
-        
-        # Volume tracking
-        self.partition_stats = {}  # volume_id -> {'total_gb': float, 'used_gb': float}
+        self.excluded_volumes = frozenset()
+        # Block device sizes in bytes, memoized within one scaling iteration
+        self._size_cache = {}
+        # Scaled volume rows of notifications that failed to send, retried with the next one
+        self._pending_notifications = []
+        # Failed scaling backoff: volume_id -> (next retry time.monotonic(), failed attempts)
+        self._backoff = {}
         
+    @functools.cached_property
+    def ec2_client(self):
+        """EC2 client, created on first use"""
+        return boto3.client('ec2', region_name=AWS_REGION)
+
+    @functools.cached_property
+    def ses_client(self):
+        """SES client, created on first use since it's only needed when notifications are enabled.
+        Cached for the process lifetime, so botocore's connection pool keeps the connection between notifications"""
+        return boto3.client('ses', region_name=AWS_REGION)
+
+    @functools.cached_property
+    def sts_client(self):
+        """STS client, created on first use"""
+        return boto3.client('sts', region_name=AWS_REGION)
+
     def load_config(self) -> bool:
         """Load and validate configuration"""
-        if not os.path.exists(self.config_file):
-            logger.error("Configuration file not found")
+        try:
+            with open(self.config_file, 'r') as f:
+                config = _parse_ini(f)
+        except FileNotFoundError:
+            logger.error(f"Configuration file not found: {self.config_file}")
+            return False
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading configuration file: {e}")
             return False
-            
-        self.config.read(self.config_file)
         
         # Validate required sections and keys
         required_sections = ['general', 'notification']
         for section in required_sections:
-            if section not in self.config:
+            if section not in config:
                 logger.error(f"Missing required section: {section}")
                 return False
                 
         # Validate general section
         general_keys = ['interval', 'threshold', 'increase_type', 'increase_gb']
         for key in general_keys:
-            if key not in self.config['general'] or not self.config['general'][key]:
+            if not config['general'].get(key):
                 logger.error(f"Missing or empty value for general.{key}")
                 return False
                 
         # Validate increase_type
-        if self.config['general']['increase_type'].lower().strip() != 'size':
-            logger.error(f"Only 'size' increase type is supported: {self.config['general']['increase_type']}")
+        if config['general']['increase_type'].lower() != 'size':
+            logger.error(f"Only 'size' increase type is supported: {config['general']['increase_type']}")
             return False
             
         # Validate notification section if enabled
-        if self.config['notification'].getboolean('enabled', False):
+        try:
+            notification_enabled = _parse_bool(config['notification'].get('enabled', 'false'))
+        except ValueError as e:
+            logger.error(f"Invalid value for notification.enabled: {e}")
+            return False
+        if notification_enabled:
             notification_keys = ['email-sender', 'email-recipients']
             for key in notification_keys:
-                if key not in self.config['notification'] or not self.config['notification'][key]:
+                if not config['notification'].get(key):
                     logger.error(f"Missing or empty value for notification.{key}")
                     return False
         
         # Load all config values into class members
         try:
             # General settings
-            self.interval = int(self.config['general']['interval'])
-            self.threshold = float(self.config['general']['threshold'])
-            self.increase_type = self.config['general']['increase_type']
-            self.increase_gb = int(self.config['general']['increase_gb'])
+            self.interval = int(config['general']['interval'])
+            self.threshold = float(config['general']['threshold'])
+            self.increase_type = config['general']['increase_type']
+            self.increase_gb = int(config['general']['increase_gb'])
             
             # Notification settings
-            self.notification_enabled = self.config['notification'].getboolean('enabled', False)
+            self.notification_enabled = notification_enabled
             if self.notification_enabled:
-                self.email_sender = self.config['notification']['email-sender']
-                self.email_recipients = [r.strip() for r in self.config['notification']['email-recipients'].split(',')]
+                self.email_sender = config['notification']['email-sender']
+                self.email_recipients = [r.strip() for r in config['notification']['email-recipients'].split(',')]
             
             # Exclude settings (optional)
-            if 'volumes' in self.config['exclude'] and self.config['exclude']['volumes']:
-                self.excluded_volumes = [v.strip() for v in self.config['exclude']['volumes'].split(',') if v.strip()]
+            excluded = config.get('exclude', {}).get('volumes', '')
+            self.excluded_volumes = frozenset(v.strip() for v in excluded.split(',') if v.strip())
             
             return True
         except (ValueError, KeyError) as e:
@@ -123,110 +461,70 @@ class EBSAutoscaler:
             return False
 
     def get_instance_id(self) -> str:
-        """Get current instance ID"""
+        """Get current instance ID (fetched from IMDSv2 once per process)"""
         try:
-            logger.info("Getting instance ID using IMDSv2 metadata service...")
-            # Get the token
-            token = subprocess.check_output(
-                [
-                    "curl", "-s", "-X", "PUT",
-                    "http://169.254.169.254/latest/api/token",
-                    "-H", "X-aws-ec2-metadata-token-ttl-seconds: 21600"
-                ],
-                text=True
-            ).strip()
-            # Use the token to get instance ID
-            instance_id = subprocess.check_output(
-                [
-                    "curl", "-s",
-                    "-H", f"X-aws-ec2-metadata-token: {token}",
-                    "http://169.254.169.254/latest/meta-data/instance-id"
-                ],
-                text=True
-            ).strip()
-
-            if not instance_id:
-                logger.error("Got empty instance ID")
-                return "unknown"
-            
-            return instance_id
+            return _fetch_instance_id()
         except Exception as e:
             logger.error(f"Error getting instance ID: {e}")
             return "unknown"
 
+    def read_nvme_volume_id(self, device_path: str) -> Optional[str]:
+        """Get EBS volume ID via NVMe identify ioctl, None if the device can't be identified this way"""
+        try:
+            return _read_ebs_volume_id(device_path)
+        except (OSError, ValueError) as e:
+            logger.info(f"NVMe identify failed for {device_path} ({e}). Falling back to 'ebsnvme-id'...")
+            return None
+
+    def list_block_devices(self) -> List[dict]:
+        """List EBS candidate block devices and their partitions from /sys/block, in the same shape as 'lsblk -J'"""
+        mounts = _read_mounts()
+
+        def read_dev_number(sys_path: str) -> str:
+            with open(f"{sys_path}/dev", 'r') as f:
+                return f.read().strip()
+
+        block_devices = []
+        for name in sorted(os.listdir('/sys/block')):
+            if not name.startswith(('nvme', 'xvd')):
+                continue
+            sys_path = f"/sys/block/{name}"
+            device = {
+                'name': name,
+                'path': f"/dev/{name}",
+                'mountpoint': mounts.get(read_dev_number(sys_path))
+            }
+            children = [
+                {
+                    'name': part,
+                    'path': f"/dev/{part}",
+                    'mountpoint': mounts.get(read_dev_number(f"{sys_path}/{part}"))
+                }
+                for part in sorted(os.listdir(sys_path))
+                if os.path.exists(f"{sys_path}/{part}/partition")
+            ]
+            if children:
+                device['children'] = children
+            block_devices.append(device)
+        return block_devices
+
     def get_volume_info(self) -> List[VolumeInfo]:
-        """Get volume information using lsblk command"""
+        """Get volume information from /sys/block, falling back to lsblk command"""
         try:
-            result = subprocess.run(['lsblk', '-b', '-o', 'NAME,PATH,MOUNTPOINT', '-J'], 
-                                  capture_output=True, text=True)
-            if result.returncode != 0:
-                logger.error("Failed to get volume information using 'lsblk' tool")
-                return []
-            
-            data = json.loads(result.stdout)
-            volumes = []
-            
-            for device in data.get('blockdevices', []):
-                # Handle both partitioned and non-partitioned volumes
-                if device.get('children'):
-                    # Handle partitioned volumes
-                    max_size = -1
-                    selected_partition = None
-                    selected_mountpoint = None
-                    
-                    # Calculate total partition size
-                    for child in device['children']:
-                        try:                            
-                            # Only consider mounted partitions
-                            if child.get('mountpoint'):
-                                usage = psutil.disk_usage(child['mountpoint'])
-                                if usage.total > max_size:
-                                    max_size = usage.total
-                                    selected_partition = child['path']
-                                    selected_mountpoint = child['mountpoint']
-                            else:
-                                logger.error(f"Partition {child.get('name')} is not mounted. Skipping...")
-                        except Exception as e:
-                            logger.error(f"Error processing partition {child.get('name')}: {e}")
-                    
-                    if selected_partition and selected_mountpoint:
-                        try:
-                            result = subprocess.run(['ebsnvme-id', '-v', selected_partition],
-                                                 capture_output=True, text=True)
-                            if result.returncode != 0:
-                                logger.error(f"Failed to get volume ID for {selected_partition}. The partition is not an EBS volume.")
-                                continue
-                                
-                            volume_id = result.stdout.split('Volume ID: ', 1)[1].strip()
-                            
-                            volumes.append(VolumeInfo(
-                                volume_id=volume_id,
-                                device_name=device['name'],
-                                mountpoint=selected_mountpoint,
-                                partition_path=selected_partition
-                            ))
-                        except Exception as e:
-                            logger.error(f"Error getting volume ID for {selected_partition}: {e}")
-                else:
-                    # Handle non-partitioned volumes (root devices)
-                    if device.get('mountpoint'):
-                        try:
-                            result = subprocess.run(['ebsnvme-id', device['path']],
-                                                 capture_output=True, text=True)
-                            if result.returncode != 0:
-                                logger.error(f"Failed to get volume ID for {device['path']}")
-                                continue
-                                
-                            volume_id = result.stdout.strip()
-                            
-                            volumes.append(VolumeInfo(
-                                volume_id=volume_id,
-                                device_name=device['name'],
-                                mountpoint=device['mountpoint'],
-                                partition_path=device['path']
-                            ))
-                        except Exception as e:
-                            logger.error(f"Error getting volume ID for {device['path']}: {e}")
+            try:
+                block_devices = self.list_block_devices()
+            except FileNotFoundError as e:
+                logger.info(f"Could not read block devices from sysfs ({e}). Falling back to 'lsblk'...")
+                result = subprocess.run(['lsblk', '-b', '-o', 'NAME,PATH,MOUNTPOINT', '-J'], 
+                                      capture_output=True, text=True)
+                if result.returncode != 0:
+                    logger.error("Failed to get volume information using 'lsblk' tool")
+                    return []
+                
+                block_devices = _json_loads(result.stdout).get('blockdevices', [])
+            with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as pool:
+                probed = pool.map(self.probe_block_device, block_devices)
+                volumes = [volume for volume in probed if volume is not None]
             
             return volumes
             
@@ -234,54 +532,159 @@ class EBSAutoscaler:
             logger.error(f"Error getting volume information: {e}")
             return []
 
+    def probe_block_device(self, device: dict) -> Optional[VolumeInfo]:
+        """Build volume information for one block device, None if it is not a mounted EBS volume"""
+        # Handle both partitioned and non-partitioned volumes
+        if device.get('children'):
+            # Handle partitioned volumes
+            max_size = -1
+            selected_partition = None
+            selected_mountpoint = None
+            
+            # Calculate total partition size
+            for child in device['children']:
+                try:                            
+                    # Only consider mounted partitions
+                    if child.get('mountpoint'):
+                        usage = psutil.disk_usage(child['mountpoint'])
+                        if usage.total > max_size:
+                            max_size = usage.total
+                            selected_partition = child['path']
+                            selected_mountpoint = child['mountpoint']
+                    else:
+                        logger.error(f"Partition {child.get('name')} is not mounted. Skipping...")
+                except Exception as e:
+                    logger.error(f"Error processing partition {child.get('name')}: {e}")
+            
+            if selected_partition and selected_mountpoint:
+                try:
+                    volume_id = self.read_nvme_volume_id(f"/dev/{device['name']}")
+                    if volume_id is None:
+                        result = subprocess.run(['ebsnvme-id', '-v', selected_partition],
+                                             capture_output=True, text=True)
+                        if result.returncode != 0:
+                            logger.error(f"Failed to get volume ID for {selected_partition}. The partition is not an EBS volume.")
+                            return None
+                            
+                        volume_id = result.stdout.split('Volume ID: ', 1)[1].strip()
+                    
+                    return VolumeInfo(
+                        volume_id=volume_id,
+                        device_name=device['name'],
+                        mountpoint=selected_mountpoint,
+                        partition_path=selected_partition
+                    )
+                except Exception as e:
+                    logger.error(f"Error getting volume ID for {selected_partition}: {e}")
+        else:
+            # Handle non-partitioned volumes (root devices)
+            if device.get('mountpoint'):
+                try:
+                    volume_id = self.read_nvme_volume_id(device['path'])
+                    if volume_id is None:
+                        result = subprocess.run(['ebsnvme-id', device['path']],
+                                             capture_output=True, text=True)
+                        if result.returncode != 0:
+                            logger.error(f"Failed to get volume ID for {device['path']}")
+                            return None
+                            
+                        volume_id = result.stdout.strip()
+                    
+                    return VolumeInfo(
+                        volume_id=volume_id,
+                        device_name=device['name'],
+                        mountpoint=device['mountpoint'],
+                        partition_path=device['path']
+                    )
+                except Exception as e:
+                    logger.error(f"Error getting volume ID for {device['path']}: {e}")
+
+        return None
+
     def save_volume_info(self, volumes) -> None:
-        """Save volume information to JSON file"""
+        """Save volume information to JSON file, skipping the write if the content is unchanged"""
         try:
             volume_data = [vars(volume) for volume in volumes]
-            with open(self.volume_info_file, 'w') as f:
-                json.dump(volume_data, f, indent=2)
+            content = _json_dumps(volume_data)
+            try:
+                with open(self.volume_info_file, 'rb') as f:
+                    if f.read() == content:
+                        return
+            except FileNotFoundError:
+                pass
+            
+            # Write to a temporary file and swap it in so readers never see a partial file
+            tmp_file = f"{self.volume_info_file}.tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_file, self.volume_info_file)
             
         except Exception as e:
             logger.error(f"Error saving volume information: {e}")
 
     def load_volume_info(self) -> List[VolumeInfo]:
         """Load volume information from JSON file"""
-        if not os.path.exists(self.volume_info_file):
-            logger.info("No volume information found. Syncing system volume info...")
+        data = _load_json(self.volume_info_file)
+        if not data:
+            if data is None:
+                logger.info("No volume information found. Syncing system volume info...")
+            else:  # If file is empty
+                logger.info("Volume information file is empty. Syncing system volume info...")
             volumes = self.get_volume_info()
             if volumes:
                 self.save_volume_info(volumes)
             return volumes
-            
-        with open(self.volume_info_file, 'r') as f:
-            data = json.load(f)
-            if not data:  # If file is empty
-                logger.info("Volume information file is empty. Syncing system volume info...")
-                volumes = self.get_volume_info()
-                if volumes:
-                    self.save_volume_info(volumes)
-                return volumes
-            return [VolumeInfo(**volume) for volume in data]
+        return [VolumeInfo(**volume) for volume in data]
 
     def get_device_size(self, device_path: str) -> int:
-        """Get the size of a block device in bytes"""
-        try:
-            result = subprocess.run(['blockdev', '--getsize64', device_path],
-                                 capture_output=True, text=True)
-            if result.returncode == 0:
-                return int(result.stdout.strip())
-            return 0
-        except Exception as e:
-            logger.error(f"Error getting device size for {device_path}: {e}")
-            return 0
+        """Get the size of a block device in bytes, memoized until invalidated in the size cache"""
+        return self.get_device_sizes([device_path])[device_path]
+
+    def get_device_sizes(self, device_paths: List[str]) -> dict:
+        """Get the sizes of block devices in bytes keyed by path (0 if unknown), memoized until invalidated in the size cache"""
+        sizes = {}
+        fallback_paths = []
+        for device_path in device_paths:
+            if device_path in self._size_cache:
+                sizes[device_path] = self._size_cache[device_path]
+                continue
+            try:
+                sizes[device_path] = _read_block_device_size(device_path)
+            except OSError as e:
+                logger.info(f"BLKGETSIZE64 ioctl failed for {device_path} ({e}). Falling back to 'blockdev'...")
+                fallback_paths.append(device_path)
+
+        # Query all devices the ioctl failed for with a single blockdev call
+        if fallback_paths:
+            try:
+                result = subprocess.run(['blockdev', '--getsize64', *fallback_paths],
+                                     capture_output=True, text=True)
+                lines = result.stdout.split()
+                if result.returncode == 0 and len(lines) == len(fallback_paths):
+                    sizes.update(zip(fallback_paths, map(int, lines)))
+                else:
+                    logger.error(f"Error getting device sizes for {', '.join(fallback_paths)}: {result.stderr.strip()}")
+            except Exception as e:
+                logger.error(f"Error getting device sizes for {', '.join(fallback_paths)}: {e}")
+
+        for device_path, size in sizes.items():
+            if size:
+                self._size_cache[device_path] = size
+        return {device_path: sizes.get(device_path, 0) for device_path in device_paths}
+
+    def describe_all_volumes(self, volume_ids: List[str]) -> dict:
+        """Describe several EBS volumes in one API call, keyed by volume ID"""
+        response = self.ec2_client.describe_volumes(VolumeIds=volume_ids)
+        return {v['VolumeId']: v for v in response['Volumes']}
 
-    def resize_volume(self, volume_id: str, new_size: int) -> bool:
-        """Resize EBS volume using boto3"""
+    def resize_volume(self, volume_id: str, new_size: int, current: Optional[dict] = None) -> bool:
+        """Resize EBS volume using boto3. `current` is a pre-fetched describe_volumes entry for the volume"""
         try:
             # First check current volume size and state
-            response = self.ec2_client.describe_volumes(VolumeIds=[volume_id])
-            current_size = response['Volumes'][0]['Size']
-            volume_state = response['Volumes'][0]['State']
+            if current is None:
+                current = self.describe_all_volumes([volume_id])[volume_id]
+            current_size = current['Size']
+            volume_state = current['State']
             
             logger.info(f"Volume {volume_id} current state: size={current_size}GB, state={volume_state}")
             
@@ -290,6 +693,9 @@ class EBSAutoscaler:
                 logger.info(f"Volume {volume_id} is already at desired size {new_size}GB and in stable state. Trying to expand filesystem...")
                 return True
             
+            # Target size of the modification, when known from our own modify_volume request
+            final_size = None
+            
             # If we need a resize and volume is not already being modified
             if current_size != new_size and volume_state != 'modifying':
                 logger.info(f"Volume {volume_id} needs resize: current={current_size}GB, target={new_size}GB")
@@ -302,50 +708,35 @@ class EBSAutoscaler:
                 if response['ResponseMetadata']['HTTPStatusCode'] != 200:
                     logger.error(f"Failed to initiate volume resize for {volume_id}. Response: {response}")
                     return False
-                logger.info(f"Volume modification request accepted for {volume_id}. Waiting for completion...")
+                final_size = response['VolumeModification']['TargetSize']
+                logger.info(f"Volume modification request accepted for {volume_id} with target size {final_size}GB. Waiting for completion...")
             else:
                 logger.info(f"Volume {volume_id} is already being modified. Waiting for completion...")
             
             # Wait for volume modification to complete
             logger.info(f"Waiting for volume {volume_id} modification to complete")
-            max_attempts = 30
-            delay = 60
-            
-            for attempt in range(max_attempts):
-                try:
-                    response = self.ec2_client.describe_volumes_modifications(VolumeIds=[volume_id])
-                    if not response['VolumesModifications']:
-                        logger.error(f"No modification found for volume {volume_id}")
-                        return False
-                        
-                    modification = response['VolumesModifications'][0]
-                    if modification['ModificationState'] == 'completed':
-                        logger.info(f"Volume {volume_id} modification completed. Verifying final size...")
-                        break
-                    elif modification['ModificationState'] == 'failed':
-                        logger.error(f"Volume {volume_id} modification failed: {modification.get('StatusMessage', 'Unknown error')}")
-                        return False
-                        
-                    logger.info(f"Volume modification in progress (attempt {attempt + 1}/{max_attempts})")
-                    time.sleep(delay)
-                except Exception as e:
-                    logger.error(f"Error checking volume modification status: {str(e)}")
-                    return False
-                    
-            if attempt == max_attempts - 1:
-                logger.error(f"Volume {volume_id} modification did not complete within {max_attempts * delay} seconds")
+            waiter = create_waiter_with_client('VolumeModified', VOLUME_MODIFIED_WAITER_MODEL, self.ec2_client)
+            try:
+                waiter.wait(VolumeIds=[volume_id])
+            except WaiterError as e:
+                modifications = (e.last_response or {}).get('VolumesModifications') or [{}]
+                status = modifications[0].get('StatusMessage', 'Unknown error')
+                logger.error(f"Volume {volume_id} modification did not complete: {e.reason} ({status})")
                 return False
+            logger.info(f"Volume {volume_id} modification completed. Verifying final size...")
                 
-            # Verify final size matches our desired size
-            response = self.ec2_client.describe_volumes(VolumeIds=[volume_id])
-            if response['Volumes'][0]['Size'] == new_size:
+            # Verify final size matches our desired size, only describing the volume
+            # if the completed modification's target size doesn't already confirm it
+            if final_size is None or final_size < new_size:
+                final_size = self.describe_all_volumes([volume_id])[volume_id]['Size']
+            if final_size == new_size:
                 logger.info(f"Volume {volume_id} successfully resized to {new_size}GB")
                 return True
-            elif response['Volumes'][0]['Size'] > new_size:
-                logger.info(f"Volume {volume_id} is now at {response['Volumes'][0]['Size']}GB, which is larger than the desired size {new_size}GB. No action needed.")
+            elif final_size > new_size:
+                logger.info(f"Volume {volume_id} is now at {final_size}GB, which is larger than the desired size {new_size}GB. No action needed.")
                 return True
             else:
-                logger.error(f"Volume {volume_id} modification completed but size {response['Volumes'][0]['Size']}GB does not match desired size {new_size}GB")
+                logger.error(f"Volume {volume_id} modification completed but size {final_size}GB does not match desired size {new_size}GB")
                 return False
             
         except ClientError as e:
@@ -362,125 +753,103 @@ class EBSAutoscaler:
             
             # Wait for root device size to update
             logger.info(f"Checking if AWS volume scaling reflected on root device {device_path} with desired size {expected_volume_total_size_gb}GB")
-            for attempt in range(12):  # Check for up to 1 minute (12 * 5s)
+            # Check for up to 1 minute, backing off from 250ms to 5s between checks
+            deadline = time.monotonic() + DEVICE_RESIZE_TIMEOUT
+            attempt = 0
+            while True:
                 try:
-                    current_size_gb = math.ceil(self.get_device_size(device_path)/(1024 ** 3))
+                    # The device size is expected to change while waiting, don't use the memoized value
+                    self._size_cache.pop(device_path, None)
+                    current_size_gb = _bytes_to_gib_ceil(self.get_device_size(device_path))
                     if current_size_gb == expected_volume_total_size_gb:
                         logger.info(f"EBS volume at root {device_path} have size synced to desired {expected_volume_total_size_gb}GB. Proceeding to expand filesystem...")
                         break
-                    logger.info(f"Device size check attempt {attempt + 1}/12: Current size {current_size_gb}GB, waiting for {expected_volume_total_size_gb}GB")
+                    logger.info(f"Device size check attempt {attempt + 1}: Current size {current_size_gb}GB, waiting for {expected_volume_total_size_gb}GB")
                 except Exception as e:
                     logger.error(f"Error checking device size: {e}")
                 
-                if attempt == 11:  # Last attempt
-                    logger.error(f"Root device {device_path} did not reach expected size after 12 attempts")
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.error(f"Root device {device_path} did not reach expected size after {DEVICE_RESIZE_TIMEOUT} seconds")
                     return False
-                time.sleep(5)
+                time.sleep(min(remaining, 5, 0.25 * 2 ** attempt))
+                attempt += 1
             
-            # Check if this is a partition (path contains p{number})
-            is_partition = 'p' in os.path.basename(partition_path)
+            # Check if this is a partition (path ends with p{number})
+            partition_match = NVME_PARTITION_RE.search(partition_path)
+            is_partition = partition_match is not None
             
             logger.info(f"Checking if {partition_path} is a partition and growable")
             if is_partition:
                 # For partitions, we need to grow the partition first
                 logger.info(f"Growing partition {partition_path} on device {device_path}")
-                partition_number = os.path.basename(partition_path).split('p')[-1]
-                
-                growpart_result = subprocess.run(
-                    ['growpart', device_path, partition_number],
-                    capture_output=True,
-                    text=True
-                )
-                
-                if growpart_result.returncode != 0:
-                    logger.error(f"Failed to grow partition '{partition_path}': {growpart_result.stderr}")
-                    return False
-                    
-                logger.info(f"Successfully grew partition: {partition_path}")
+            partition_number = partition_match.group(1) if is_partition else ''
             
-            # Check filesystem type
+            # Grow the partition and expand the filesystem in a single shell
             logger.info(f"Checking filesystem type for {partition_path} to expand")
-            result = subprocess.run(['blkid', '-o', 'value', '-s', 'TYPE', partition_path],
-                                 capture_output=True, text=True)
+            fs_type = _filesystem_type(partition_path) or ''
+            logger.info(f"Expanding {fs_type or 'unknown'} filesystem on {partition_path}")
+            result = subprocess.run(
+                ['/bin/sh', '-c', EXPAND_FILESYSTEM_SCRIPT, 'expand-filesystem',
+                 device_path, partition_number, partition_path, mountpoint, fs_type],
+                capture_output=True,
+                text=True
+            )
             fs_type = result.stdout.strip()
             
-            # Expand filesystem
-            try:
-                logger.info(f"Expanding {fs_type} filesystem on {partition_path}")
-                if fs_type == 'xfs':
-                    # xfs_growfs uses mountpoint to expand the filesystem
-                    result = subprocess.run(['xfs_growfs', '-d', mountpoint], 
-                                         capture_output=True, text=True)
-                    if result.returncode != 0:
-                        logger.error(f"Failed to expand XFS filesystem: {result.stderr}")
-                        return False
-                else:
-                    # resize2fs uses partition path to expand the filesystem
-                    result = subprocess.run(['resize2fs', partition_path],
-                                         capture_output=True, text=True)
-                    if result.returncode != 0:
-                        logger.error(f"Failed to expand ext filesystem: {result.stderr}")
-                        return False
-                
-                logger.info(f"Successfully expanded {fs_type} filesystem on {partition_path}")
-                return True
-            except subprocess.CalledProcessError as e:
-                logger.error(f"Failed to expand filesystem on {partition_path}: {e}")
+            if result.returncode != 0:
+                step = EXPAND_FILESYSTEM_STEPS.get(result.returncode, 'expand filesystem')
+                logger.error(f"Failed to {step} on '{partition_path}': {result.stderr}")
                 return False
+            
+            if is_partition:
+                self._size_cache.pop(partition_path, None)
+                logger.info(f"Successfully grew partition: {partition_path}")
+            logger.info(f"Successfully expanded {fs_type} filesystem on {partition_path}")
+            return True
                     
         except Exception as e:
             logger.error(f"Error expanding filesystem on {partition_path}: {e}")
             return False
 
-    def send_notification(self, volumes_scaled: List[dict]) -> None:
-        """Send email notification about volume resize using SES"""
+    def has_pending_notifications(self) -> bool:
+        """Check if scaled volumes of a failed notification are waiting to be sent"""
+        return bool(self._pending_notifications)
+
+    def send_notification(self, volumes_scaled: List[dict]) -> bool:
+        """Send email notification about volume resize using SES. Volumes of failed sends are kept and sent with the next call"""
         if not self.notification_enabled:
-            return
+            return True
             
+        if self._pending_notifications:
+            logger.info(f"Including {len(self._pending_notifications)} scaled volumes from a failed notification")
+        volumes_scaled = self._pending_notifications + volumes_scaled
+        self._pending_notifications = []
         try:
-            logger.info("Getting instance id for notification...")
-            instance_id = self.get_instance_id()
             if not volumes_scaled:
                 logger.error("No scale info provided for sending notification. Skipping...")
-                return
+                return True
             
-            # Build HTML table of volume information
-            html_table = """
-            <table style="border-collapse: collapse; width: 100%;">
-                <thead>
-                    <tr style="background-color: #f2f2f2;">
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Volume ID</th>
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Mount Point</th>
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Device Name</th>
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Partition Path</th>
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: right;">Scale Threshold</th>
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: right;">Expanded by size(GB)</th>
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: right;">Previous Device size(GB)</th>
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: right;">New Device size(GB)</th>
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: right;">New Overall Volume size(GB)</th>
-                    </tr>
-                </thead>
-                <tbody>"""
+            logger.info("Getting instance id for notification...")
+            instance_id = self.get_instance_id()
             
+            # Build HTML table of volume information
+            rows = []
             for scaled_volume in volumes_scaled:
                 logger.info(f"Found scaled volume: {scaled_volume['volume'].volume_id}, Preparing to send notification...")
-                stats = self.partition_stats.get(scaled_volume['volume'].volume_id, {})
-                html_table += f"""
-                    <tr>
-                        <td style="border: 1px solid #ddd; padding: 8px;">{scaled_volume['volume'].volume_id}</td>
-                        <td style="border: 1px solid #ddd; padding: 8px;">{scaled_volume['volume'].mountpoint or 'N/A'}</td>
-                        <td style="border: 1px solid #ddd; padding: 8px;">{scaled_volume['volume'].device_name or 'N/A'}</td>
-                        <td style="border: 1px solid #ddd; padding: 8px;">{scaled_volume['volume'].partition_path or 'N/A'}</td>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{self.threshold}%</td>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{scaled_volume['expanded_size_gb']}</td>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{scaled_volume['last_device_size_gb']}</td>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{scaled_volume['new_device_size_total_gb']}</td>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{scaled_volume['new_volume_size_gb']}</td>
-                    </tr>"""
-            
-            html_table += """
-                </tbody>
-            </table>"""
+                volume = scaled_volume['volume']
+                rows.append(NOTIFICATION_ROW_TEMPLATE.format_map({
+                    'volume_id': volume.volume_id,
+                    'mountpoint': volume.mountpoint or 'N/A',
+                    'device_name': volume.device_name or 'N/A',
+                    'partition_path': volume.partition_path or 'N/A',
+                    'threshold': self.threshold,
+                    'expanded_size_gb': scaled_volume['expanded_size_gb'],
+                    'last_device_size_gb': scaled_volume['last_device_size_gb'],
+                    'new_device_size_total_gb': scaled_volume['new_device_size_total_gb'],
+                    'new_volume_size_gb': scaled_volume['new_volume_size_gb']
+                }))
+            html_table = NOTIFICATION_TABLE_HEAD + ''.join(rows) + NOTIFICATION_TABLE_TAIL
             
             subject = f"⚠️📈 EBS Volume Scaling Alert: Multiple Volumes Resized on Instance {instance_id}"
             
@@ -518,22 +887,40 @@ class EBSAutoscaler:
             
             if response['ResponseMetadata']['HTTPStatusCode'] == 200:
                 logger.info(f"Notification sent for volumes scaled on instance {instance_id} to {len(self.email_recipients)} recipients")
-            else:
-                logger.error(f"Failed to send notification for scaled volumes list")
+                return True
+            logger.error(f"Failed to send notification for scaled volumes list")
             
         except ClientError as e:
             logger.error(f"Error sending notification: {e}")
         except Exception as e:
             logger.error(f"Unexpected error sending notification: {e}")
+        
+        # Keep the most recent volumes to retry with the next notification
+        self._pending_notifications = volumes_scaled[-MAX_PENDING_NOTIFICATIONS:]
+        logger.info(f"Retrying notification for {len(self._pending_notifications)} scaled volumes in the next interval")
+        return False
+
+    def get_partition_paths(self, device_name: str) -> List[str]:
+        """Get partition paths of a block device from /proc/partitions, or the device itself if unpartitioned"""
+        with open('/proc/partitions', 'r') as f:
+            # Skip the "major minor #blocks name" header
+            names = [line.split()[3] for line in f.readlines()[1:] if line.strip()]
 
-    def is_scaling_required(self, volume: VolumeInfo) -> tuple[bool, float, float]:
+        # Kernel names partitions nvme0n1p1 for devices ending in a digit, xvda1 otherwise
+        prefix = f"{device_name}p" if device_name[-1].isdigit() else device_name
+        partitions = [
+            f"/dev/{name}" for name in names
+            if name.startswith(prefix) and name[len(prefix):].isdigit()
+        ]
+        return partitions or [f"/dev/{device_name}"]
+
+    def is_scaling_required(self, volume: VolumeInfo) -> tuple[bool, float, int]:
         """Check disk usage and determine if scaling is needed"""
         try:
-            usage = psutil.disk_usage(volume.mountpoint)
+            total_bytes, _, usage_percent = _disk_usage(volume.mountpoint)
 
             do_scale = False
-            current_total_gb = (usage.total / (1024 ** 3))
-            usage_percent = usage.percent
+            current_total_gb = _bytes_to_gib_ceil(total_bytes)
 
             size_to_scale = 0
             if usage_percent > self.threshold:
@@ -545,61 +932,104 @@ class EBSAutoscaler:
             logger.error(f"Error checking disk usage for {volume.mountpoint}: {e}")
             return False, 0, 0
             
-    def perform_scaling(self, volume: VolumeInfo, total_new_size_quote_gb: float) -> bool:
-        """Perform scaling operation"""
+    def is_backing_off(self, volume_id: str) -> bool:
+        """Check if scaling a volume is being held back after previous failures"""
+        return time.monotonic() < self._backoff.get(volume_id, (0, 0))[0]
+
+    def record_scaling_result(self, volume_id: str, success: bool) -> None:
+        """Clear the backoff of a volume on success, or double its retry delay on failure"""
+        if success:
+            self._backoff.pop(volume_id, None)
+            return
+        attempts = self._backoff.get(volume_id, (0, 0))[1] + 1
+        delay = min(self.interval * 2 ** (attempts - 1), MAX_SCALING_BACKOFF)
+        self._backoff[volume_id] = (time.monotonic() + delay, attempts)
+        logger.info(f"Scaling volume {volume_id} failed {attempts} time(s). Next retry in {delay} seconds")
+
+    def perform_scaling(self, volume: VolumeInfo, total_new_size_quote_gb: int, current: Optional[dict] = None) -> tuple[bool, int, int]:
+        """Perform scaling operation. `current` is a pre-fetched describe_volumes entry for the volume.
+        Returns (success, partition size in bytes, device size in bytes) with sizes read after the expansion"""
         try:
+            # Sizes may have changed since the last scaling iteration
+            self._size_cache.clear()
+
             # Step 1: Get volume total size
             root_device_name = volume.device_name
             root_device_path = f"/dev/{root_device_name}" # /dev/nvme0n1
             volume_total_size_bytes = self.get_device_size(root_device_path)
-            volume_total_size_gb = volume_total_size_bytes / (1024 ** 3)
+            volume_total_size_gb = _bytes_to_gib_ceil(volume_total_size_bytes)
 
             # Step 2: Get partition sizes and its sum of all
-            partitions = [
-                p.device for p in psutil.disk_partitions(all=True)
-                if p.device.startswith(root_device_path)
-            ]
-            partition_sum_bytes = 0
-            for partition in partitions:
-                partition_sum_bytes += self.get_device_size(partition)
+            partitions = self.get_partition_paths(root_device_name)
+            with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as pool:
+                partition_sum_bytes = sum(pool.map(self.get_device_size, partitions))
 
             # Step 3: Calculate free space in the volume
             free_space_bytes = volume_total_size_bytes - partition_sum_bytes
-            free_space_gb = free_space_bytes / (1024 ** 3)
 
-            # Step 4: Calculate final size to scale
-            additional_volume_needed_gb = math.ceil(self.increase_gb - free_space_gb)
+            # Step 4: Calculate final size to scale, ceil(increase - free) == increase - floor(free)
+            additional_volume_needed_gb = self.increase_gb - _bytes_to_gib(free_space_bytes)
 
             # Step 5: Check if we have enough free space to scale
             if additional_volume_needed_gb > 0:
                 try:
-                    expected_new_volume_total_size_gb = math.ceil(volume_total_size_gb + additional_volume_needed_gb)
+                    expected_new_volume_total_size_gb = volume_total_size_gb + additional_volume_needed_gb
                     if additional_volume_needed_gb < self.increase_gb:
-                        logger.info(f"Combining available unused space of {free_space_gb:.2f}GB on volume {volume.volume_id} for scaling to reach {expected_new_volume_total_size_gb}GB")
-                    if self.resize_volume(volume.volume_id, expected_new_volume_total_size_gb):
+                        logger.info(f"Combining available unused space of {free_space_bytes / GIB:.2f}GB on volume {volume.volume_id} for scaling to reach {expected_new_volume_total_size_gb}GB")
+                    if self.resize_volume(volume.volume_id, expected_new_volume_total_size_gb, current):
                         logger.info(f"EBS Volume {volume.volume_id} resized to {expected_new_volume_total_size_gb}GB from {volume_total_size_gb}GB")
                     else:
                         logger.error(f"Failed to resize volume {volume.volume_id} to {additional_volume_needed_gb}GB")
-                        return False
+                        return False, 0, 0
                 except Exception as e:
                     logger.error(f"Error resizing volume: {e}")
-                    return False
+                    return False, 0, 0
             else:
                 # If no scale only expand then the volume size remains the same
                 logger.info(f'Found enough free space to expand the volume to {volume_total_size_gb}GB')
-                expected_new_volume_total_size_gb = math.ceil(volume_total_size_gb)
+                expected_new_volume_total_size_gb = volume_total_size_gb
             
             logger.info(f"Starting to expand filesystem to the fully available size of the EBS volume")
             if self.expand_filesystem(volume, expected_new_volume_total_size_gb):
-                logger.info(f"EBS Volume {volume.volume_id} expanded to {math.ceil(total_new_size_quote_gb):.2f}GB")
+                logger.info(f"EBS Volume {volume.volume_id} expanded to {total_new_size_quote_gb:.2f}GB")
             else:
                 logger.error(f"Failed to expand filesystem on volume {volume.volume_id}")
-                return False
+                return False, 0, 0
+            
+            new_sizes = self.get_device_sizes([volume.partition_path, root_device_path])
+            return True, new_sizes[volume.partition_path], new_sizes[root_device_path]
                 
         except Exception as e:
             logger.error(f"Error performing scaling operation: {e}")
-            return False
+            return False, 0, 0
         
+    def resolve_tools(self, tools) -> dict:
+        """Resolve tools on PATH, reusing the on-disk cache while PATH and the tool list are unchanged"""
+        key = hashlib.sha256(
+            (os.environ.get('PATH', os.defpath) + '|'.join(sorted(tools))).encode()
+        ).hexdigest()
+        try:
+            if time.time() - os.stat(TOOLS_CACHE_FILE).st_mtime < TOOLS_CACHE_TTL:
+                with open(TOOLS_CACHE_FILE, 'rb') as f:
+                    cached = _json_loads(f.read())
+                if cached.get('key') == key:
+                    return cached['tools']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+        found = _find_tools(tools)
+        # Only cache a complete lookup so newly installed tools are picked up on the next start
+        if len(found) == len(tools):
+            try:
+                os.makedirs(os.path.dirname(TOOLS_CACHE_FILE), mode=0o755, exist_ok=True)
+                tmp_file = f"{TOOLS_CACHE_FILE}.tmp"
+                with open(tmp_file, 'wb') as f:
+                    f.write(_json_dumps({'key': key, 'tools': found}))
+                os.replace(tmp_file, TOOLS_CACHE_FILE)
+            except OSError as e:
+                logger.warning(f"Failed to save tool lookup cache: {e}")
+        return found
+
     def validate_prerequisites(self) -> bool:
         """Validate all prerequisites before starting the service"""
         try:
@@ -614,46 +1044,44 @@ class EBSAutoscaler:
                 'resize2fs': 'Expand ext filesystem'
             }
             
+            found_tools = self.resolve_tools(required_tools)
             for tool, purpose in required_tools.items():
-                result = subprocess.run(['which', tool], capture_output=True, text=True)
-                if result.returncode != 0:
+                if tool not in found_tools:
                     logger.error(f"Required tool '{tool}' ({purpose}) not found in PATH")
                     return False
-                logger.info(f"Tool '{tool}' found: {result.stdout.strip()}")
+                logger.info(f"Tool '{tool}' found: {found_tools[tool]}")
 
-            # 2. Check config file permissions
-            if not os.path.exists(self.config_file):
-                logger.error(f"Config file not found: {self.config_file}")
-                return False
-                
-            if not os.access(self.config_file, os.R_OK):
-                logger.error(f"Config file not readable: {self.config_file}")
+            # 2. Check volume info directory permissions
+            volume_info_dir = os.path.dirname(self.volume_info_file)
+            try:
+                os.makedirs(volume_info_dir, mode=0o755, exist_ok=True)
+            except Exception as e:
+                logger.error(f"Failed to create volume info directory: {e}")
                 return False
                 
-            # 3. Check volume info directory permissions
-            volume_info_dir = os.path.dirname(self.volume_info_file)
-            if not os.path.exists(volume_info_dir):
-                try:
-                    os.makedirs(volume_info_dir, mode=0o755)
-                except Exception as e:
-                    logger.error(f"Failed to create volume info directory: {e}")
-                    return False
-                    
+            # access() also honours read-only mounts and ACLs, which mode bits don't show
             if not os.access(volume_info_dir, os.W_OK):
                 logger.error(f"Volume info directory not writable: {volume_info_dir}")
                 return False
 
-            # 4. Check AWS credentials
+            # 3. Check AWS credentials (GetCallerIdentity needs no permissions and doesn't use EC2 API quota)
             try:
-                self.ec2_client.describe_volumes(MaxResults=10)
+                self.sts_client.get_caller_identity()
             except Exception as e:
                 logger.error(f"AWS credentials validation failed: {e}")
                 return False
 
-            # 5. Check if running as root (required for device operations)
-            if os.geteuid() != 0:
-                logger.error("Service must be run as root for device operations")
-                return False
+            # 4. Check capabilities for device operations, root is not needed. A non-root user needs
+            # them as ambient capabilities too (e.g. systemd AmbientCapabilities=) so the expand tools inherit them
+            required_capabilities = {
+                'CAP_SYS_ADMIN': (CAP_SYS_ADMIN, 'NVMe identify ioctl, growpart and xfs_growfs'),
+                'CAP_SYS_RESOURCE': (CAP_SYS_RESOURCE, 'Online ext4 resize with resize2fs'),
+                'CAP_DAC_OVERRIDE': (CAP_DAC_OVERRIDE, 'Open root:disk device nodes and write state files')
+            }
+            for name, (cap, purpose) in required_capabilities.items():
+                if not _has_capability(cap):
+                    logger.error(f"Required capability {name} ({purpose}) is missing from the effective or ambient set")
+                    return False
 
             logger.info("All prerequisites validated successfully")
             return True
@@ -691,43 +1119,82 @@ def monitor(
         sys.exit(1)
     logger.info("Volume information loaded successfully")
     
-    logger.info(f"Monitoring {len(volumes)} EBS volumes...")
+    # Exclusions only change on service restart, so filter them out once
+    active_volumes = []
+    for volume in volumes:
+        if volume.volume_id in scaler.excluded_volumes:
+            logger.info(f"Skipping excluded volume {volume.volume_id}")
+            continue
+        active_volumes.append(volume)
+    
+    logger.info(f"Monitoring {len(active_volumes)} EBS volumes...")
+    
+    # Installed only now so a Ctrl-C during a hung startup call still raises KeyboardInterrupt
+    def handle_stop_signal(signum, frame):
+        logger.info(f"Received {signal.Signals(signum).name}. Stopping after the current operation...")
+        _stop.set()
+    
+    signal.signal(signal.SIGTERM, handle_stop_signal)
+    signal.signal(signal.SIGINT, handle_stop_signal)
     
     while True:
         # Track the volumes scaled in this interval
         volumes_scaled = []
+        # Volumes above threshold, scaled after all checks so AWS describes can be batched
+        volumes_to_scale = []
         
-        for volume in volumes:
-            if volume.volume_id in scaler.excluded_volumes:
-                logger.info(f"Skipping excluded volume {volume.volume_id}")
-                continue
-            
-
-            # Check disk usage and determine if scaling is needed
-            do_scale, usage_percent, new_device_size_total_gb = scaler.is_scaling_required(volume)
-            
+        # Check disk usage and determine if scaling is needed. The checks are I/O bound
+        # so they run concurrently, scaling itself stays sequential
+        checks = []
+        if active_volumes:
+            with ThreadPoolExecutor(max_workers=min(32, len(active_volumes))) as pool:
+                checks = list(zip(active_volumes, pool.map(scaler.is_scaling_required, active_volumes)))
+        
+        for volume, (do_scale, usage_percent, new_device_size_total_gb) in checks:
             if do_scale:
+                if scaler.is_backing_off(volume.volume_id):
+                    logger.info(f"Partition {volume.partition_path} is at {usage_percent}% usage, above the set threshold {scaler.threshold}%, but scaling is backing off after previous failures. Skipping...")
+                    continue
                 logger.info(f"Partition {volume.partition_path} is at {usage_percent}% usage, above the set threshold {scaler.threshold}% . Initiating scaling operation.")
-                try:
-                    if scaler.perform_scaling(volume, new_device_size_total_gb):
+                volumes_to_scale.append((volume, new_device_size_total_gb))
+            else:
+                logger.info(f"Volume {volume.volume_id} is at {usage_percent}% usage, below the set threshold. No scaling required.")
+                continue
+        
+        described_volumes = {}
+        if volumes_to_scale:
+            try:
+                described_volumes = scaler.describe_all_volumes([volume.volume_id for volume, _ in volumes_to_scale])
+            except ClientError as e:
+                logger.error(f"Error describing volumes to scale, describing individually instead: {e}")
+        
+        for volume, new_device_size_total_gb in volumes_to_scale:
+            if _stop.is_set():
+                break
+            try:
+                scaled, partition_bytes, device_bytes = scaler.perform_scaling(
+                    volume, new_device_size_total_gb, described_volumes.get(volume.volume_id)
+                )
+                scaler.record_scaling_result(volume.volume_id, scaled)
+                if scaled:
+                    # Scale details are only needed for the notification
+                    if scaler.notification_enabled:
                         volumes_scaled.append({
                             'volume': volume,
-                            'last_device_size_gb': f"{math.ceil(new_device_size_total_gb - scaler.increase_gb):.2f}",
-                            'expanded_size_gb': f"{math.ceil(new_device_size_total_gb - (new_device_size_total_gb - scaler.increase_gb)):.2f}",
-                            'new_device_size_total_gb': f"{math.ceil(scaler.get_device_size(volume.partition_path)/(1024 ** 3)):.2f}",
-                            'new_volume_size_gb': f"{math.ceil(scaler.get_device_size(f'/dev/{volume.device_name}')/(1024 ** 3)):.2f}"
+                            'last_device_size_gb': f"{new_device_size_total_gb - scaler.increase_gb:.2f}",
+                            'expanded_size_gb': f"{scaler.increase_gb:.2f}",
+                            'new_device_size_total_gb': f"{_bytes_to_gib_ceil(partition_bytes):.2f}",
+                            'new_volume_size_gb': f"{_bytes_to_gib_ceil(device_bytes):.2f}"
                         })
-                    else:
-                        logger.error(f"Failed to scale volume {volume.volume_id}. Retrying in next interval...")
-                        continue
-                except Exception as e:
-                    logger.error(f"Error performing scaling operation: {e}")
+                else:
+                    logger.error(f"Failed to scale volume {volume.volume_id}. Retrying after backoff...")
                     continue
-            else:
-                logger.info(f"Volume {volume.volume_id} is at {usage_percent}% usage, below the set threshold. No scaling required.")
+            except Exception as e:
+                logger.error(f"Error performing scaling operation: {e}")
+                scaler.record_scaling_result(volume.volume_id, False)
                 continue
         
-        if volumes_scaled:
+        if volumes_scaled or scaler.has_pending_notifications():
             logger.info(f"Sending notification for {len(volumes_scaled)} volumes scaled")
             try:
                 scaler.send_notification(volumes_scaled)
@@ -742,7 +1209,11 @@ def monitor(
         minutes = scaler.interval // 60
         seconds = scaler.interval % 60
         logger.info(f"Checking again in {minutes} minutes and {seconds} seconds")
-        time.sleep(scaler.interval)
+        if _stop.wait(scaler.interval):
+            break
+    
+    if _stop.is_set():
+        logger.info("EBS Volume Auto-scaling service stopped")
 
 if __name__ == "__main__":
     app()